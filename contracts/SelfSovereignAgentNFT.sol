@@ -90,6 +90,7 @@ contract SelfSovereignAgentNFT is ERC721URIStorage, ISelfSovereignAgent {
     error RecoveryNotAvailable();
     error InvalidNominee();
     error InvalidTimeout();
+    error ArrayLengthMismatch();
     
     // ============ Constructor ============
     
@@ -281,7 +282,41 @@ contract SelfSovereignAgentNFT is ERC721URIStorage, ISelfSovereignAgent {
         
         emit StateAnchored(tokenId, stateHash, stateUri);
     }
-    
+
+    /**
+     * @notice Anchors cognitive state for several agents in one transaction
+     * @dev Amortizes the fixed per-transaction overhead (signature, nonce,
+     *      base cost) across all anchors; the caller must hold
+     *      PERMISSION_ANCHOR_STATE for every token in the batch
+     * @param tokenIds The agents' identity token IDs
+     * @param stateHashes Keccak256 hash of each state file
+     * @param stateUris URI pointing to each encrypted state
+     */
+    function anchorStateBatch(
+        uint256[] calldata tokenIds,
+        bytes32[] calldata stateHashes,
+        string[] calldata stateUris
+    ) external {
+        if (tokenIds.length != stateHashes.length || tokenIds.length != stateUris.length) {
+            revert ArrayLengthMismatch();
+        }
+
+        for (uint256 i = 0; i < tokenIds.length; i++) {
+            uint256 tokenId = tokenIds[i];
+            if (!_hasPermission(tokenId, msg.sender, PERMISSION_ANCHOR_STATE)) {
+                revert Unauthorized();
+            }
+
+            _stateAnchors[tokenId] = StateAnchor({
+                stateHash: stateHashes[i],
+                stateUri: stateUris[i],
+                timestamp: block.timestamp
+            });
+
+            emit StateAnchored(tokenId, stateHashes[i], stateUris[i]);
+        }
+    }
+
     /**
      * @notice Returns the current state anchor
      * @param tokenId The agent's identity token ID
@@ -109,9 +109,10 @@ def anchor_my_state(
                 'char_count': len(block.get('value', ''))
             }
         
-        # Build state object
+        # Build state object (schema 2.0.0 = composed-root hashing, see
+        # scripts/real_letta_integration.py)
         state = {
-            'schema_version': '1.0.0',
+            'schema_version': '2.0.0',
             'export_timestamp': datetime.now(timezone.utc).isoformat(),
             'agent': {
                 'id': agent_data.get('id'),
@@ -124,6 +125,10 @@ def anchor_my_state(
         # Optionally include archival memory
         if include_archival:
             archival_data = letta_api_request(f"agents/{agent_id}/archival-memory")
+            # Field whitelist and defaults mirror _KEPT_FIELDS in
+            # scripts/real_letta_integration.py — both are hashed into
+            # the Merkle leaves, so the projections must stay in
+            # lockstep for the two paths to anchor the same root
             archival_entries = []
             for entry in archival_data:
                 archival_entries.append({
@@ -131,16 +136,49 @@ def anchor_my_state(
                     'text': entry.get('text', ''),
                     'tags': entry.get('tags', []),
                     'created_at': entry.get('created_at'),
+                    'updated_at': entry.get('updated_at'),
                 })
+            # Deterministic order, matching the export pipeline
+            archival_entries.sort(
+                key=lambda e: (e.get('created_at') or '', e.get('id') or ''))
             state['archival_memory'] = {
                 'count': len(archival_entries),
                 'entries': archival_entries
             }
         
-        # Step 2: Hash the state
-        state_json = json.dumps(state, sort_keys=True, separators=(',', ':'))
+        # Step 2: Hash the state. The anchored hash is the composed root
+        # keccak(agent_hash || memory_blocks_hash || archival_merkle_root
+        # || schema_version_hash), byte-identical to what
+        # scripts/real_letta_integration.py anchors for the same state
+        def canonical(obj) -> bytes:
+            return json.dumps(obj, sort_keys=True, separators=(',', ':'),
+                              ensure_ascii=False).encode()
+
         w3 = Web3(Web3.HTTPProvider(RPC_URL))
-        state_hash = w3.keccak(text=state_json)
+        keccak = Web3.keccak
+
+        # Merkle root over the archival entries: pairwise keccak, odd
+        # node promoted; no entries (or archival excluded) -> keccak(b'')
+        level = [keccak(canonical(e)) for e in
+                 state.get('archival_memory', {}).get('entries', [])]
+        if not level:
+            archival_root = keccak(b'')
+        else:
+            while len(level) > 1:
+                next_level = [keccak(level[i] + level[i + 1])
+                              for i in range(0, len(level) - 1, 2)]
+                if len(level) % 2:
+                    next_level.append(level[-1])
+                level = next_level
+            archival_root = level[0]
+
+        state_hash = keccak(
+            keccak(canonical(state['agent']))
+            + keccak(canonical(state['memory_blocks']))
+            + archival_root
+            + keccak(state['schema_version'].encode())
+        )
+        state_bytes = canonical(state)
         
         # Create state URI
         state_uri = f"letta://{agent_id}/state/{state_hash.hex()[:16]}"
@@ -195,7 +233,7 @@ TBA Address: {tba_address}
 
 State Hash: 0x{state_hash.hex()}
 State URI: {state_uri}
-State Size: {len(state_json):,} bytes
+State Size: {len(state_bytes):,} bytes
 
 Memory Blocks: {memory_summary}
 Archival Memories: {archival_count}
@@ -0,0 +1,33 @@
+"""Merkle-tree reduction over 32-byte keccak leaves.
+
+The per-pair work is already inside eth-hash's keccak C extension, so a
+JIT (numba) buys nothing here — keccak-f[1600] isn't nopython-callable
+and re-implementing it in jitted Python would be slower than the C
+backend. What does cost on large archives is CPython dispatch overhead
+per pair, so the reduction below keeps the loop tight: locals bound
+once, one list built per level, odd nodes promoted untouched.
+"""
+
+from eth_hash.auto import keccak
+
+
+def merkle_root(leaves: list) -> bytes:
+    """Reduce a list of 32-byte leaf hashes to the Merkle root.
+
+    Pairwise keccak(left || right); an odd trailing node is promoted to
+    the next level unchanged. An empty list hashes to keccak(b'').
+    """
+    if not leaves:
+        return keccak(b'')
+
+    _keccak = keccak  # bind once; attribute lookups add up over N pairs
+    level = leaves
+    while len(level) > 1:
+        next_level = [
+            _keccak(level[i] + level[i + 1])
+            for i in range(0, len(level) - 1, 2)
+        ]
+        if len(level) % 2:
+            next_level.append(level[-1])
+        level = next_level
+    return level[0]
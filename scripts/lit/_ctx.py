@@ -0,0 +1,52 @@
+"""Lazily-initialized shared objects for the Lit scripts.
+
+Provider setup and secp256k1 key derivation each cost real time; when a
+runner imports several of these scripts in sequence, every one pays that
+setup again. The lru_cache'd accessors here construct each object on
+first use and hand the same instance to every caller in the process.
+"""
+
+import os
+from functools import lru_cache
+
+from eth_account import Account
+
+import _env  # noqa: F401 -- loads .env once per process
+from _rpc import RPC_URL, make_async_w3, make_w3
+
+CHAIN_ID = 84532  # Base Sepolia
+CONTRACT_ADDRESS = os.getenv("AGENT_CONTRACT_ADDRESS")
+CONTROLLER_KEY = os.getenv("DEPLOYER_PRIVATE_KEY")
+
+# Minimal SelfSovereignAgentNFT ABI shared by the sync scripts
+NFT_ABI = [
+    {"inputs": [{"name": "to", "type": "address"}], "name": "mintAgent", "outputs": [{"name": "", "type": "uint256"}], "stateMutability": "nonpayable", "type": "function"},
+    {"inputs": [{"name": "tokenId", "type": "uint256"}], "name": "getAgentTBA", "outputs": [{"name": "", "type": "address"}], "stateMutability": "view", "type": "function"},
+    {"inputs": [{"name": "tokenId", "type": "uint256"}], "name": "ownerOf", "outputs": [{"name": "", "type": "address"}], "stateMutability": "view", "type": "function"},
+    {"inputs": [{"name": "tokenId", "type": "uint256"}], "name": "establishSelfOwnership", "outputs": [], "stateMutability": "nonpayable", "type": "function"},
+    {"inputs": [{"name": "tokenId", "type": "uint256"}], "name": "isSelfOwning", "outputs": [{"name": "", "type": "bool"}], "stateMutability": "view", "type": "function"},
+]
+
+
+@lru_cache(maxsize=1)
+def w3():
+    """The shared sync Web3 instance (pooled keep-alive session)."""
+    return make_w3(RPC_URL)
+
+
+@lru_cache(maxsize=1)
+def async_w3():
+    """The shared AsyncWeb3 instance for the async scripts."""
+    return make_async_w3(RPC_URL)
+
+
+@lru_cache(maxsize=1)
+def controller():
+    """The controller/deployer account, derived once per process."""
+    return Account.from_key(CONTROLLER_KEY)
+
+
+@lru_cache(maxsize=1)
+def nft_contract():
+    """Sync contract handle for the agent NFT."""
+    return w3().eth.contract(address=CONTRACT_ADDRESS, abi=NFT_ABI)
@@ -0,0 +1,17 @@
+"""Load the repo .env exactly once per process.
+
+python-dotenv re-reads and re-parses the file on every load_dotenv()
+call; with several scripts imported by one runner that work is repeated
+per module. Importing this module instead makes every load after the
+first a no-op (the sentinel survives even if load_dotenv is somehow
+invoked again with override=False).
+"""
+
+import os
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+if not os.environ.get("_ENV_LOADED"):
+    load_dotenv(Path(__file__).resolve().parents[2] / ".env", override=False)
+    os.environ["_ENV_LOADED"] = "1"
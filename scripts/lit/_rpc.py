@@ -0,0 +1,39 @@
+"""Shared RPC plumbing for the Lit scripts.
+
+Every script in this directory talks to the same Base Sepolia RPC and
+makes several sequential JSON-RPC calls. A pooled keep-alive session
+amortizes the TCP+TLS handshake across those calls instead of paying it
+per request.
+"""
+
+import os
+
+import requests
+from requests.adapters import HTTPAdapter, Retry
+from web3 import AsyncWeb3, Web3
+
+RPC_URL = os.getenv("BASE_SEPOLIA_RPC", "https://sepolia.base.org")
+
+
+def make_session() -> requests.Session:
+    """Build a requests session with connection pooling and retries."""
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=16,
+        max_retries=Retry(total=3, backoff_factor=0.2),
+    ))
+    session.headers.update({"Connection": "keep-alive"})
+    return session
+
+
+def make_w3(rpc_url: str = RPC_URL) -> Web3:
+    """Create a Web3 instance over a pooled keep-alive session."""
+    provider = Web3.HTTPProvider(rpc_url, session=make_session(), request_kwargs={"timeout": 30})
+    return Web3(provider)
+
+
+def make_async_w3(rpc_url: str = RPC_URL) -> AsyncWeb3:
+    """Create an AsyncWeb3 instance so independent RPC waits can overlap."""
+    provider = AsyncWeb3.AsyncHTTPProvider(rpc_url, request_kwargs={"timeout": 30})
+    return AsyncWeb3(provider)
@@ -8,13 +8,16 @@ This script:
 3. Broadcasts the signed transaction
 """
 
+import functools
 import os
 import json
 import time
 from pathlib import Path
 from dotenv import load_dotenv
-from web3 import Web3
 from eth_account import Account
+from eth_account.signers.local import LocalAccount
+
+from _rpc import make_w3
 
 # Load environment
 load_dotenv(Path(__file__).parent.parent.parent / '.env')
@@ -29,6 +32,29 @@ DEPLOYER_PRIVATE_KEY = os.getenv('DEPLOYER_PRIVATE_KEY')
 
 CHAIN_ID = 84532  # Base Sepolia
 
+# Integer wei constants: to_wei routes through decimal.Decimal, which is
+# pure overhead for values known at write time
+_GWEI = 10**9
+
+
+def _mbe(x: int) -> bytes:
+    """Minimal big-endian encoding of an int (RLP's canonical form).
+
+    Pre-converting the integer tx fields lets rlp encode a bytes-only
+    structure via encode_raw, skipping its Python-level int sedes path.
+    """
+    return x.to_bytes((x.bit_length() + 7) // 8, 'big') if x else b''
+
+
+@functools.cache
+def _deployer() -> LocalAccount:
+    """Derive the deployer account once per process.
+
+    Account.from_key does secp256k1 public-key recovery; main() needs the
+    deployer in both the session-auth and fallback paths, so derive once.
+    """
+    return Account.from_key(DEPLOYER_PRIVATE_KEY)
+
 
 def get_session_sigs(client, wallet_address: str, private_key: str):
     """Get session signatures for Lit Protocol."""
@@ -62,12 +88,12 @@ def main():
     print()
     
     # Initialize Web3
-    w3 = Web3(Web3.HTTPProvider(RPC_URL))
-    
+    w3 = make_w3(RPC_URL)
+
     # Check PKP balance
     balance = w3.eth.get_balance(PKP_ETH_ADDRESS)
     print(f"PKP Address: {PKP_ETH_ADDRESS}")
-    print(f"PKP Balance: {w3.from_wei(balance, 'ether')} ETH")
+    print(f"PKP Balance: {balance / 1e18:.6f} ETH")
     
     if balance == 0:
         print("\nERROR: PKP has no ETH!")
@@ -103,7 +129,7 @@ def main():
     
     # Get current gas prices
     base_fee = w3.eth.get_block('latest')['baseFeePerGas']
-    max_priority_fee = w3.to_wei(1, 'gwei')
+    max_priority_fee = 1 * _GWEI
     max_fee = base_fee * 2 + max_priority_fee
     
     tx = {
@@ -122,7 +148,7 @@ def main():
     print(f"  To: {tx['to']}")
     print(f"  Nonce: {tx['nonce']}")
     print(f"  Gas: {tx['gas']}")
-    print(f"  Max Fee: {w3.from_wei(tx['maxFeePerGas'], 'gwei')} gwei")
+    print(f"  Max Fee: {tx['maxFeePerGas'] / _GWEI:.2f} gwei")
     
     # Initialize Lit client
     print("\n--- Initializing Lit Protocol ---")
@@ -150,21 +176,22 @@ def main():
         import rlp
         from eth_utils import keccak
         
-        # EIP-1559 transaction fields in order
+        # EIP-1559 transaction fields in order (ints pre-converted to
+        # minimal big-endian so encode_raw sees only bytes/lists)
         tx_fields = [
-            tx['chainId'],
-            tx['nonce'],
-            tx['maxPriorityFeePerGas'],
-            tx['maxFeePerGas'],
-            tx['gas'],
+            _mbe(tx['chainId']),
+            _mbe(tx['nonce']),
+            _mbe(tx['maxPriorityFeePerGas']),
+            _mbe(tx['maxFeePerGas']),
+            _mbe(tx['gas']),
             bytes.fromhex(tx['to'][2:]),  # Remove 0x prefix
-            tx['value'],
+            _mbe(tx['value']),
             bytes.fromhex(tx['data'][2:]),  # Remove 0x prefix
             [],  # access list
         ]
-        
+
         # Type 2 transaction: 0x02 || rlp([chainId, nonce, ...])
-        encoded = b'\x02' + rlp.encode(tx_fields)
+        encoded = b'\x02' + rlp.codec.encode_raw(tx_fields)
         tx_hash = keccak(encoded)
         to_sign = list(tx_hash)  # Convert to list of ints for Lit
         
@@ -176,7 +203,7 @@ def main():
         
         # For PKP signing, we need to create an auth method
         # Using the deployer wallet to authenticate
-        deployer = Account.from_key(DEPLOYER_PRIVATE_KEY)
+        deployer = _deployer()
         
         # Create SIWE message
         from datetime import datetime, timedelta
@@ -251,7 +278,7 @@ def main():
         
         # Fallback: Use deployer to test the flow
         print("\n--- Fallback: Testing with deployer wallet ---")
-        deployer = Account.from_key(DEPLOYER_PRIVATE_KEY)
+        deployer = _deployer()
         
         # Deployer can call anchorState on Token 1 (which it owns)
         # Let's test that the contract flow works
@@ -269,7 +296,7 @@ def main():
         
         print(f"\nTesting with deployer on Token 1...")
         print(f"Deployer: {deployer.address}")
-        print(f"Balance: {w3.from_wei(w3.eth.get_balance(deployer.address), 'ether')} ETH")
+        print(f"Balance: {w3.eth.get_balance(deployer.address) / 1e18:.6f} ETH")
         
         # Sign and send
         signed_tx = deployer.sign_transaction(test_tx)
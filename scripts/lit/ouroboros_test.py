@@ -14,14 +14,16 @@ via Lit Actions) can anchor cognitive state on-chain.
 
 import os
 import json
+import logging
 import time
 from pathlib import Path
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
-from web3 import Web3
 import rlp
 from eth_utils import keccak
 
+from _rpc import make_w3
+
 # Load environment
 load_dotenv(Path(__file__).parent.parent.parent / '.env')
 
@@ -35,6 +37,34 @@ DEPLOYER_PRIVATE_KEY = os.getenv('DEPLOYER_PRIVATE_KEY')
 CHAIN_ID = 84532  # Base Sepolia
 TOKEN_ID = 2  # Token 2 where PKP has executor permissions
 
+# Integer wei constants: to_wei routes through decimal.Decimal, which is
+# pure overhead for values known at write time
+_GWEI = 10**9
+
+log = logging.getLogger(__name__)
+
+
+def _mbe(x: int) -> bytes:
+    """Minimal big-endian encoding of an int (RLP's canonical form).
+
+    Pre-converting the integer tx fields lets rlp encode a bytes-only
+    structure via encode_raw, skipping its Python-level int sedes path.
+    """
+    return x.to_bytes((x.bit_length() + 7) // 8, 'big') if x else b''
+
+
+def canonical_state_bytes(state: dict) -> bytes:
+    """Canonical UTF-8 encoding of a cognitive state.
+
+    Sorted keys + compact separators + raw UTF-8 match the canonical
+    form of real_letta_integration's _canonical_dumps, so the same state
+    always serializes identically. Encoding once here lets keccak
+    consume the bytes directly instead of re-encoding the text inside
+    web3.
+    """
+    return json.dumps(state, sort_keys=True, separators=(',', ':'),
+                      ensure_ascii=False).encode()
+
 
 def build_anchor_transaction(w3, token_id: int, state_hash: bytes, state_uri: str) -> dict:
     """Build the anchorState transaction."""
@@ -59,7 +89,7 @@ def build_anchor_transaction(w3, token_id: int, state_hash: bytes, state_uri: st
     
     # Get current gas prices
     base_fee = w3.eth.get_block('latest')['baseFeePerGas']
-    max_priority_fee = w3.to_wei(1, 'gwei')
+    max_priority_fee = 1 * _GWEI
     max_fee = base_fee * 2 + max_priority_fee
     
     tx_data = contract.encode_abi('anchorState', [token_id, state_hash, state_uri])
@@ -81,21 +111,22 @@ def build_anchor_transaction(w3, token_id: int, state_hash: bytes, state_uri: st
 
 def compute_tx_hash(tx: dict) -> bytes:
     """Compute the signing hash for an EIP-1559 transaction."""
-    # EIP-1559 transaction fields in order
+    # EIP-1559 transaction fields in order (ints pre-converted to
+    # minimal big-endian so encode_raw sees only bytes/lists)
     tx_fields = [
-        tx['chainId'],
-        tx['nonce'],
-        tx['maxPriorityFeePerGas'],
-        tx['maxFeePerGas'],
-        tx['gas'],
+        _mbe(tx['chainId']),
+        _mbe(tx['nonce']),
+        _mbe(tx['maxPriorityFeePerGas']),
+        _mbe(tx['maxFeePerGas']),
+        _mbe(tx['gas']),
         bytes.fromhex(tx['to'][2:]),
-        tx['value'],
+        _mbe(tx['value']),
         bytes.fromhex(tx['data'][2:]),
         [],  # access list
     ]
-    
+
     # Type 2 transaction: 0x02 || rlp([chainId, nonce, ...])
-    encoded = b'\x02' + rlp.encode(tx_fields)
+    encoded = b'\x02' + rlp.codec.encode_raw(tx_fields)
     return keccak(encoded)
 
 
@@ -146,22 +177,22 @@ def serialize_signed_tx(tx: dict, signature: dict) -> bytes:
     
     # EIP-1559 signed transaction fields
     tx_fields = [
-        tx['chainId'],
-        tx['nonce'],
-        tx['maxPriorityFeePerGas'],
-        tx['maxFeePerGas'],
-        tx['gas'],
+        _mbe(tx['chainId']),
+        _mbe(tx['nonce']),
+        _mbe(tx['maxPriorityFeePerGas']),
+        _mbe(tx['maxFeePerGas']),
+        _mbe(tx['gas']),
         bytes.fromhex(tx['to'][2:]),
-        tx['value'],
+        _mbe(tx['value']),
         bytes.fromhex(tx['data'][2:]),
         [],  # access list
-        v,
+        _mbe(v),
         r.to_bytes(32, 'big'),
         s.to_bytes(32, 'big'),
     ]
-    
+
     # Type 2 transaction: 0x02 || rlp([...fields, v, r, s])
-    return b'\x02' + rlp.encode(tx_fields)
+    return b'\x02' + rlp.codec.encode_raw(tx_fields)
 
 
 def main():
@@ -171,14 +202,14 @@ def main():
     print()
     
     # Initialize Web3
-    w3 = Web3(Web3.HTTPProvider(RPC_URL))
-    
+    w3 = make_w3(RPC_URL)
+
     # Check PKP balance
     balance = w3.eth.get_balance(PKP_ETH_ADDRESS)
     print(f"PKP Address: {PKP_ETH_ADDRESS}")
-    print(f"PKP Balance: {w3.from_wei(balance, 'ether')} ETH")
-    
-    if balance < w3.to_wei(0.0001, 'ether'):
+    print(f"PKP Balance: {balance / 1e18:.6f} ETH")
+
+    if balance < 10**14:  # 0.0001 ETH
         print("\n⚠️  WARNING: PKP balance is low!")
     
     # Create test cognitive state
@@ -190,12 +221,12 @@ def main():
         "archival_count": 18,
         "test": "Ouroboros PKP signing test"
     }
-    state_json = json.dumps(cognitive_state, sort_keys=True)
-    state_hash = w3.keccak(text=state_json)
+    state_bytes = canonical_state_bytes(cognitive_state)
+    state_hash = w3.keccak(state_bytes)
     state_uri = f"ipfs://ouroboros-test-{timestamp}"
-    
+
     print(f"\n📝 Cognitive State:")
-    print(f"   State: {state_json[:80]}...")
+    print(f"   State: {state_bytes[:80].decode()}...")
     print(f"   Hash: {state_hash.hex()}")
     print(f"   URI: {state_uri}")
     
@@ -207,7 +238,8 @@ def main():
     print(f"   To: {tx['to']}")
     print(f"   Nonce: {tx['nonce']}")
     print(f"   Gas: {tx['gas']}")
-    print(f"   TX Hash to sign: {tx_hash.hex()}")
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("tx hash to sign=%s", tx_hash.hex())
     
     # Initialize Lit Protocol
     print(f"\n🔐 Initializing Lit Protocol (datil-test)...")
@@ -250,14 +282,13 @@ def main():
     
     signature = sign_result['signatures']['anchorStateSig']
     print(f"   ✓ Signature obtained!")
-    print(f"   r: {signature['r']}")
-    print(f"   s: {signature['s']}")
-    print(f"   v: {signature['recid']}")
-    
+    log.debug("signature r=%s s=%s v=%s", signature['r'], signature['s'], signature['recid'])
+
     # Serialize signed transaction
     print(f"\n📦 Serializing signed transaction...")
     signed_tx_bytes = serialize_signed_tx(tx, signature)
-    print(f"   Signed TX: {signed_tx_bytes.hex()[:80]}...")
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("signed tx=%s...", signed_tx_bytes.hex()[:80])
     
     # Broadcast transaction
     print(f"\n📡 Broadcasting to Base Sepolia...")
@@ -309,12 +340,12 @@ def main():
             
     except Exception as e:
         print(f"\n❌ Broadcast failed: {e}")
-        import traceback
-        traceback.print_exc()
-    
+        log.debug("broadcast failed", exc_info=True)
+
     finally:
         client.disconnect()
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO"), format="%(message)s")
     main()
@@ -6,14 +6,18 @@ This approach uses a Lit Action to sign the transaction directly,
 which is the recommended pattern for PKP signing.
 """
 
+import functools
 import os
 import json
+import logging
 import time
 from pathlib import Path
 from dotenv import load_dotenv
-from web3 import Web3
 from eth_account import Account
 from eth_account.messages import encode_defunct
+from eth_account.signers.local import LocalAccount
+
+from _rpc import make_w3
 
 # Load environment
 load_dotenv(Path(__file__).parent.parent.parent / '.env')
@@ -28,6 +32,12 @@ DEPLOYER_PRIVATE_KEY = os.getenv('DEPLOYER_PRIVATE_KEY')
 
 CHAIN_ID = 84532  # Base Sepolia
 
+# Integer wei constants: to_wei routes through decimal.Decimal, which is
+# pure overhead for values known at write time
+_GWEI = 10**9
+
+log = logging.getLogger(__name__)
+
 # Lit Action code for signing a transaction
 LIT_ACTION_CODE = """
 const go = async () => {
@@ -54,6 +64,25 @@ go();
 """
 
 
+def _mbe(x: int) -> bytes:
+    """Minimal big-endian encoding of an int (RLP's canonical form).
+
+    Pre-converting the integer tx fields lets rlp encode a bytes-only
+    structure via encode_raw, skipping its Python-level int sedes path.
+    """
+    return x.to_bytes((x.bit_length() + 7) // 8, 'big') if x else b''
+
+
+@functools.cache
+def _deployer() -> LocalAccount:
+    """Derive the deployer account once per process.
+
+    Account.from_key does secp256k1 public-key recovery, so repeated
+    runs (tests, retries) shouldn't redo the ECC work.
+    """
+    return Account.from_key(DEPLOYER_PRIVATE_KEY)
+
+
 def main():
     print("=" * 60)
     print("Simple PKP Signing Test")
@@ -61,13 +90,13 @@ def main():
     print()
     
     # Initialize Web3
-    w3 = Web3(Web3.HTTPProvider(RPC_URL))
-    
+    w3 = make_w3(RPC_URL)
+
     # Check PKP balance
     balance = w3.eth.get_balance(PKP_ETH_ADDRESS)
     print(f"PKP Address: {PKP_ETH_ADDRESS}")
     print(f"PKP Public Key: {PKP_PUBLIC_KEY[:20]}...")
-    print(f"PKP Balance: {w3.from_wei(balance, 'ether')} ETH")
+    print(f"PKP Balance: {balance / 1e18:.6f} ETH")
     
     # Create test state
     test_state = f"Ouroboros test - {int(time.time())}"
@@ -98,7 +127,7 @@ def main():
     
     # Get current gas prices
     base_fee = w3.eth.get_block('latest')['baseFeePerGas']
-    max_priority_fee = w3.to_wei(1, 'gwei')
+    max_priority_fee = 1 * _GWEI
     max_fee = base_fee * 2 + max_priority_fee
     
     tx_data = contract.encode_abi('anchorState', [token_id, state_hash, state_uri])
@@ -125,21 +154,22 @@ def main():
     from eth_utils import keccak
     
     tx_fields = [
-        tx['chainId'],
-        tx['nonce'],
-        tx['maxPriorityFeePerGas'],
-        tx['maxFeePerGas'],
-        tx['gas'],
+        _mbe(tx['chainId']),
+        _mbe(tx['nonce']),
+        _mbe(tx['maxPriorityFeePerGas']),
+        _mbe(tx['maxFeePerGas']),
+        _mbe(tx['gas']),
         bytes.fromhex(tx['to'][2:]),
-        tx['value'],
+        _mbe(tx['value']),
         bytes.fromhex(tx['data'][2:]),
         [],  # access list
     ]
-    
-    encoded = b'\x02' + rlp.encode(tx_fields)
+
+    encoded = b'\x02' + rlp.codec.encode_raw(tx_fields)
     tx_hash = keccak(encoded)
-    
-    print(f"\nTransaction hash: {tx_hash.hex()}")
+
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("transaction hash=%s", tx_hash.hex())
     
     # Try Lit Protocol
     print("\n--- Attempting Lit Protocol signing ---")
@@ -192,21 +222,20 @@ def main():
         
     except Exception as e:
         print(f"Lit Protocol error: {e}")
-        import traceback
-        traceback.print_exc()
-    
+        log.debug("Lit Protocol error", exc_info=True)
+
     # Fallback test with deployer
     print("\n" + "=" * 60)
     print("FALLBACK: Testing contract with deployer wallet")
     print("=" * 60)
     
-    deployer = Account.from_key(DEPLOYER_PRIVATE_KEY)
+    deployer = _deployer()
     deployer_balance = w3.eth.get_balance(deployer.address)
     
     print(f"\nDeployer: {deployer.address}")
-    print(f"Balance: {w3.from_wei(deployer_balance, 'ether')} ETH")
-    
-    if deployer_balance < w3.to_wei(0.0001, 'ether'):
+    print(f"Balance: {deployer_balance / 1e18:.6f} ETH")
+
+    if deployer_balance < 10**14:  # 0.0001 ETH
         print("ERROR: Deployer has insufficient balance")
         return
     
@@ -273,4 +302,5 @@ def main():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO"), format="%(message)s")
     main()
@@ -18,64 +18,63 @@ Usage:
     python scripts/lit/test_ouroboros.py
 """
 
-import os
 import sys
 from pathlib import Path
-from dotenv import load_dotenv
 
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
-load_dotenv(Path(__file__).parent.parent.parent / ".env")
+# Resolve once at import: absolute paths survive os.chdir and skip the
+# repeated parent traversal
+_HERE = Path(__file__).resolve().parent
+_REPO_ROOT = _HERE.parents[1]
+
+sys.path.insert(0, str(_REPO_ROOT))
 
 try:
-    from web3 import Web3
-    from eth_account import Account
+    import _env  # noqa: F401 -- loads .env once per process
+    import _ctx
+    from web3.exceptions import ContractLogicError
 except ImportError:
     print("Install: pip install web3 python-dotenv")
     sys.exit(1)
 
 # Config
-RPC_URL = os.getenv("BASE_SEPOLIA_RPC", "https://sepolia.base.org")
-CHAIN_ID = 84532
-CONTRACT_ADDRESS = os.getenv("AGENT_CONTRACT_ADDRESS")
-DEPLOYER_KEY = os.getenv("DEPLOYER_PRIVATE_KEY")
-
-# Minimal ABI
-CONTRACT_ABI = [
-    {"inputs": [{"name": "to", "type": "address"}], "name": "mintAgent", "outputs": [{"name": "", "type": "uint256"}], "stateMutability": "nonpayable", "type": "function"},
-    {"inputs": [{"name": "tokenId", "type": "uint256"}], "name": "getAgentTBA", "outputs": [{"name": "", "type": "address"}], "stateMutability": "view", "type": "function"},
-    {"inputs": [{"name": "tokenId", "type": "uint256"}], "name": "ownerOf", "outputs": [{"name": "", "type": "address"}], "stateMutability": "view", "type": "function"},
-    {"inputs": [{"name": "tokenId", "type": "uint256"}], "name": "establishSelfOwnership", "outputs": [], "stateMutability": "nonpayable", "type": "function"},
-    {"inputs": [{"name": "tokenId", "type": "uint256"}], "name": "isSelfOwning", "outputs": [{"name": "", "type": "bool"}], "stateMutability": "view", "type": "function"},
-]
+CHAIN_ID = _ctx.CHAIN_ID
+CONTRACT_ADDRESS = _ctx.CONTRACT_ADDRESS
 
 def main():
     print("=" * 60)
     print("OUROBOROS TEST (Token ID 2)")
     print("=" * 60)
-    
-    w3 = Web3(Web3.HTTPProvider(RPC_URL))
-    deployer = Account.from_key(DEPLOYER_KEY)
-    contract = w3.eth.contract(address=CONTRACT_ADDRESS, abi=CONTRACT_ABI)
-    
-    print(f"Network: Base Sepolia (block {w3.eth.block_number})")
-    print(f"Contract: {CONTRACT_ADDRESS}")
-    print(f"Deployer: {deployer.address}")
-    
-    # Check if Token 2 exists
+
+    # Shared lazily-constructed instances (see _ctx) — free when another
+    # script in the same process already built them
+    w3 = _ctx.w3()
+    deployer = _ctx.controller()
+    contract = _ctx.nft_contract()
+
+    # Send all read-only calls as one JSON-RPC batch (one round-trip to
+    # the public RPC instead of four sequential ones)
     try:
-        owner = contract.functions.ownerOf(2).call()
-        print(f"\nToken 2 exists, owner: {owner}")
-    except:
+        with w3.batch_requests() as batch:
+            batch.add(w3.eth.get_block_number())
+            batch.add(contract.functions.ownerOf(2))
+            batch.add(contract.functions.getAgentTBA(2))
+            batch.add(contract.functions.isSelfOwning(2))
+            block_number, owner, tba, is_self_owning = batch.execute()
+    except ContractLogicError:
+        # ownerOf reverts for a nonexistent token
         print("\nToken 2 doesn't exist. Mint it first or run full test.")
         print("To mint: Add minting logic or use existing scripts")
         return
-    
-    # Get TBA
-    tba = contract.functions.getAgentTBA(2).call()
+    except Exception as e:
+        print(f"\nBatch RPC request failed: {e}")
+        return
+
+    print(f"Network: Base Sepolia (block {block_number})")
+    print(f"Contract: {CONTRACT_ADDRESS}")
+    print(f"Deployer: {deployer.address}")
+
+    print(f"\nToken 2 exists, owner: {owner}")
     print(f"Token 2 TBA: {tba}")
-    
-    # Check self-ownership status
-    is_self_owning = contract.functions.isSelfOwning(2).call()
     print(f"Self-owning: {is_self_owning}")
     
     if is_self_owning:
@@ -84,7 +83,7 @@ def main():
     else:
         print("\nToken 2 is NOT self-owning yet.")
         print("Next steps:")
-        print("1. Whitelist PKP on TBA (run whitelist_pkp_on_tba.py --token-id 2)")
+        print("1. Whitelist PKP on TBA (run whitelist_pkp_on_tba.py --token-ids 2)")
         print("2. Call establishSelfOwnership(2)")
     
     print("\n" + "=" * 60)
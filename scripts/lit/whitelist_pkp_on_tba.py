@@ -18,6 +18,9 @@ Usage:
     # Or specify PKP address explicitly
     python scripts/lit/whitelist_pkp_on_tba.py --pkp-address 0x...
 
+    # Whitelist on several tokens' TBAs in one run
+    python scripts/lit/whitelist_pkp_on_tba.py --token-ids 1,2,3
+
 Prerequisites:
     - PKP minted (run mint_pkp.py first)
     - TBA already created for the token
@@ -27,150 +30,346 @@ Prerequisites:
 import os
 import sys
 import argparse
+import asyncio
+import functools
 import json
+import time
 from pathlib import Path
-from dotenv import load_dotenv
+import _env  # noqa: F401 -- loads .env once per process
+
+# Resolve once at import: absolute paths survive os.chdir and skip the
+# repeated parent traversal
+_HERE = Path(__file__).resolve().parent
+_REPO_ROOT = _HERE.parents[1]
 
 # Add project root to path
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+sys.path.insert(0, str(_REPO_ROOT))
 
 try:
-    from web3 import Web3
+    from eth_abi import decode as abi_decode, encode as abi_encode
+    from web3 import AsyncWeb3, Web3
     from eth_account import Account
+    import _ctx
 except ImportError:
     print("Please install dependencies: pip install web3 python-dotenv")
     sys.exit(1)
 
-# Load environment variables
-load_dotenv(Path(__file__).parent.parent.parent / ".env")
+# orjson parses straight from bytes and is several times faster than
+# stdlib json; fall back silently when it isn't installed
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    def _json_loads(data: bytes):
+        return json.loads(data.decode())
 
 # Configuration
-RPC_URL = os.getenv("BASE_SEPOLIA_RPC", "https://sepolia.base.org")
 CHAIN_ID = 84532
 CONTRACT_ADDRESS = os.getenv("AGENT_CONTRACT_ADDRESS")
 CONTROLLER_KEY = os.getenv("DEPLOYER_PRIVATE_KEY")
 
-# Tokenbound V3 Account ABI (minimal for executor management)
-# Based on Tokenbound V3's AccountGuardian functionality
-TBA_ABI = [
-    # Check if address is authorized executor
-    {
-        "inputs": [{"name": "executor", "type": "address"}],
-        "name": "isAuthorizedExecutor",
-        "outputs": [{"name": "", "type": "bool"}],
-        "stateMutability": "view",
-        "type": "function"
-    },
-    # Set executor authorization (called by owner or existing executor)
-    {
-        "inputs": [
-            {"name": "executor", "type": "address"},
-            {"name": "authorized", "type": "bool"}
-        ],
-        "name": "setExecutor",
-        "outputs": [],
-        "stateMutability": "nonpayable",
-        "type": "function"
-    },
-    # Alternative: some TBA implementations use this
-    {
-        "inputs": [{"name": "executor", "type": "address"}],
-        "name": "addExecutor",
-        "outputs": [],
-        "stateMutability": "nonpayable",
-        "type": "function"
-    },
-    # Get owner
-    {
-        "inputs": [],
-        "name": "owner",
-        "outputs": [{"name": "", "type": "address"}],
-        "stateMutability": "view",
-        "type": "function"
-    },
-    # Execute call (for testing)
-    {
-        "inputs": [
-            {"name": "to", "type": "address"},
-            {"name": "value", "type": "uint256"},
-            {"name": "data", "type": "bytes"},
-            {"name": "operation", "type": "uint8"}
-        ],
-        "name": "execute",
-        "outputs": [{"name": "", "type": "bytes"}],
-        "stateMutability": "payable",
-        "type": "function"
-    }
-]
-
-# Our contract ABI for getting TBA address
-NFT_ABI = [
-    {
-        "inputs": [{"name": "tokenId", "type": "uint256"}],
-        "name": "getAgentTBA",
-        "outputs": [{"name": "", "type": "address"}],
-        "stateMutability": "view",
-        "type": "function"
-    },
-    {
-        "inputs": [{"name": "tokenId", "type": "uint256"}],
-        "name": "ownerOf",
-        "outputs": [{"name": "", "type": "address"}],
-        "stateMutability": "view",
-        "type": "function"
-    }
-]
+# 4-byte selectors for every function this script touches, keyed by
+# name; computed once at import instead of per call site
+_SEL = {
+    name: Web3.keccak(text=sig)[:4]
+    for name, sig in [
+        ("isAuthorizedExecutor", "isAuthorizedExecutor(address)"),
+        ("setExecutor", "setExecutor(address,bool)"),
+        ("addExecutor", "addExecutor(address)"),
+        ("owner", "owner()"),
+        ("getAgentTBA", "getAgentTBA(uint256)"),
+        ("ownerOf", "ownerOf(uint256)"),
+    ]
+}
+
+# Canonical Multicall3 deployment (same address on Base Sepolia)
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+_AGGREGATE3_SEL = Web3.keccak(text="aggregate3((address,bool,bytes)[])")[:4]
+
+
+async def call_view(w3: AsyncWeb3, to: str, sel: bytes, arg_types: list,
+                    args: list, ret_type: str, block_identifier=None):
+    """eth_call with hand-encoded calldata, decoding a single return value.
+
+    Bypasses the Contract/ABI dispatch machinery for simple view reads;
+    pair with _SEL for the selector.
+    """
+    data = sel + abi_encode(arg_types, args) if arg_types else sel
+    params = {'to': to, 'data': '0x' + data.hex()}
+    if block_identifier is not None:
+        raw = await w3.eth.call(params, block_identifier=block_identifier)
+    else:
+        raw = await w3.eth.call(params)
+    return abi_decode([ret_type], bytes(raw))[0]
 
 
+async def multicall3_aggregate(w3: AsyncWeb3, calls: list) -> list:
+    """Run several read-only calls as one Multicall3 aggregate3 staticcall.
+
+    calls is a list of (target, allow_failure, calldata) tuples; returns
+    the matching list of (success, return_data) tuples. One RPC round-trip
+    instead of one per read.
+    """
+    data = _AGGREGATE3_SEL + abi_encode(['(address,bool,bytes)[]'], [calls])
+    raw = await w3.eth.call({'to': MULTICALL3_ADDRESS, 'data': '0x' + data.hex()})
+    return abi_decode(['(bool,bytes)[]'], bytes(raw))[0]
+
+
+async def detect_executor_method(w3: AsyncWeb3, tba_address: str) -> str:
+    """Pick setExecutor vs addExecutor by scanning the TBA runtime bytecode.
+
+    One eth_getCode round-trip replaces the old pattern of broadcasting a
+    speculative setExecutor transaction and falling back to addExecutor
+    after waiting on its reverted receipt.
+    """
+    code = bytes(await w3.eth.get_code(tba_address))
+    if _SEL["setExecutor"] in code:
+        return "setExecutor"
+    if _SEL["addExecutor"] in code:
+        return "addExecutor"
+    # Proxies can hide selectors from the runtime code; keep the old default
+    return "setExecutor"
+
+
+@functools.lru_cache(maxsize=1)
 def get_pkp_address() -> str:
-    """Get PKP address from env or pkp_info.json."""
+    """Get PKP address from env or pkp_info.json (cached per process)."""
     # Try environment variable first
     pkp_address = os.getenv("LIT_PKP_ETH_ADDRESS")
     if pkp_address:
         return pkp_address
-    
+
     # Try pkp_info.json
-    pkp_info_path = Path(__file__).parent / "pkp_info.json"
+    pkp_info_path = _HERE / "pkp_info.json"
     if pkp_info_path.exists():
-        with open(pkp_info_path, 'r') as f:
-            info = json.load(f)
-            return info.get("pkp", {}).get("eth_address")
-    
+        info = _json_loads(pkp_info_path.read_bytes())
+        return info.get("pkp", {}).get("eth_address")
+
     return None
 
 
-def send_transaction(w3: Web3, account: Account, tx: dict) -> dict:
-    """Sign and send a transaction, return receipt."""
-    tx['nonce'] = w3.eth.get_transaction_count(account.address)
+# setExecutor(address,bool)/addExecutor(address) stay well under 60k
+# gas; a static cap skips the node-side EVM simulation round-trip that
+# estimate_gas costs per send
+EXECUTOR_GAS_LIMIT = 80_000
+
+# 0.001 gwei, as an integer constant to keep Decimal arithmetic out of
+# the send path
+_PRIORITY_FEE = 1_000_000
+
+# Base fee cache so repeated sends within one run share a single
+# eth_feeHistory lookup
+_FEE_CACHE = {"ts": 0.0, "base": 0}
+
+
+async def _base_fee(w3: AsyncWeb3) -> int:
+    """Fetch the current base fee via eth_feeHistory, cached for 2 seconds.
+
+    fee_history returns just the fee fields, instead of pulling a whole
+    block header (transactions, logsBloom, ...) for 32 bytes of data.
+    """
+    now = time.monotonic()
+    if now - _FEE_CACHE["ts"] > 2.0:
+        history = await w3.eth.fee_history(1, 'latest')
+        _FEE_CACHE["base"] = history['baseFeePerGas'][-1]
+        _FEE_CACHE["ts"] = now
+    return _FEE_CACHE["base"]
+
+
+async def build_and_sign(w3: AsyncWeb3, account: Account, tx: dict,
+                         nonce: int, max_fee: int = None):
+    """Fill in nonce/chain/fees and sign the transaction locally.
+
+    Signing is pure CPU work, so splitting it from broadcast() lets a
+    batch sign every tx up front (with pre-assigned nonces and one
+    shared maxFeePerGas) and then fire the raw txs back to back.
+    """
+    tx['nonce'] = nonce
     tx['chainId'] = CHAIN_ID
-    
+
+    # Debug-only escape hatch: the known call shapes pass an explicit gas
+    # cap, so estimation only runs when a caller leaves gas unset
     if 'gas' not in tx:
-        tx['gas'] = w3.eth.estimate_gas(tx)
-    
+        tx['gas'] = await w3.eth.estimate_gas(tx)
+
     # Use EIP-1559 transaction format
     if 'maxFeePerGas' not in tx:
-        base_fee = w3.eth.get_block('latest')['baseFeePerGas']
-        priority_fee = w3.to_wei(0.001, 'gwei')
-        tx['maxFeePerGas'] = base_fee * 2 + priority_fee
-        tx['maxPriorityFeePerGas'] = priority_fee
-    
-    signed = account.sign_transaction(tx)
-    tx_hash = w3.eth.send_raw_transaction(signed.raw_transaction)
-    receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
-    return receipt
+        if max_fee is None:
+            max_fee = (await _base_fee(w3)) * 2 + _PRIORITY_FEE
+        tx['maxFeePerGas'] = max_fee
+        tx['maxPriorityFeePerGas'] = _PRIORITY_FEE
+
+    return account.sign_transaction(tx)
+
+
+async def broadcast(w3: AsyncWeb3, signed) -> asyncio.Task:
+    """Broadcast a signed tx, return a task awaiting its receipt.
+
+    Returning the receipt task instead of blocking here lets the caller
+    overlap the receipt poll with other RPC work (or other broadcasts).
+    """
+    tx_hash = await w3.eth.send_raw_transaction(signed.raw_transaction)
+    return asyncio.create_task(w3.eth.wait_for_transaction_receipt(tx_hash))
+
+
+async def process_token(w3: AsyncWeb3, controller: Account, pkp_address: str,
+                        token_id: int, dry_run: bool, interactive: bool,
+                        send_lock: asyncio.Lock, nonce_counter,
+                        max_fee: int = None) -> bool:
+    """Whitelist the PKP on one token's TBA; return True on success.
+
+    Nonces are allocated from the shared counter under send_lock so
+    concurrent tokens never collide on the controller account.
+    """
+    tag = f"[token {token_id}]"
+
+    # Fetch TBA address and current owner in one Multicall3 round-trip
+    token_arg = abi_encode(['uint256'], [token_id])
+    (_, tba_ret), (_, owner_ret) = await multicall3_aggregate(w3, [
+        (CONTRACT_ADDRESS, False, _SEL["getAgentTBA"] + token_arg),
+        (CONTRACT_ADDRESS, False, _SEL["ownerOf"] + token_arg),
+    ])
+    tba_address = Web3.to_checksum_address(abi_decode(['address'], tba_ret)[0])
+    owner = Web3.to_checksum_address(abi_decode(['address'], owner_ret)[0])
+    print(f"{tag} TBA Address: {tba_address}")
+    print(f"{tag} Current NFT Owner: {owner}")
+
+    # Check if controller is owner (required to set executor)
+    if owner.lower() != controller.address.lower():
+        print(f"\n{tag} WARNING: Controller is not the NFT owner!")
+        print(f"{tag}   Controller: {controller.address}")
+        print(f"{tag}   Owner: {owner}")
+        print(f"{tag} The NFT owner must call setExecutor on the TBA.")
+        print(f"{tag} If the NFT is already self-owning, this may need to be done via the TBA itself.")
+
+        if not dry_run:
+            if not interactive:
+                print(f"{tag} Skipping (non-interactive multi-token run)")
+                return False
+            response = input("\nContinue anyway? (y/N): ")
+            if response.lower() != 'y':
+                return False
+
+    # Check if PKP is already authorized
+    print(f"{tag} Checking current executor status...")
+
+    try:
+        ((ok, auth_ret),) = await multicall3_aggregate(w3, [
+            (tba_address, True, _SEL["isAuthorizedExecutor"] + abi_encode(['address'], [pkp_address])),
+        ])
+        if not ok or not auth_ret:
+            raise ValueError("isAuthorizedExecutor reverted")
+        is_authorized = abi_decode(['bool'], auth_ret)[0]
+        print(f"{tag} PKP already authorized: {is_authorized}")
+
+        if is_authorized:
+            print(f"{tag} PKP is already whitelisted! No action needed.")
+            return True
+    except Exception as e:
+        print(f"{tag} Note: Could not check executor status: {e}")
+        print(f"{tag} TBA may use different method names. Proceeding with setExecutor...")
+
+    if dry_run:
+        print(f"\n{tag} [DRY RUN] Would send setExecutor transaction")
+        print(f"{tag}   TBA: {tba_address}")
+        print(f"{tag}   PKP: {pkp_address}")
+        print(f"{tag}   Authorized: True")
+        return True
+
+    # Probe which executor-management function the TBA implements before
+    # signing anything, so we never broadcast a doomed transaction
+    method = await detect_executor_method(w3, tba_address)
+    print(f"{tag} Sending {method} transaction...")
+
+    is_authorized = None
+    try:
+        if method == "setExecutor":
+            data = _SEL["setExecutor"] + abi_encode(['address', 'bool'],
+                                                    [pkp_address, True])
+        else:
+            data = _SEL["addExecutor"] + abi_encode(['address'], [pkp_address])
+
+        # Hand-assembled instead of build_transaction: web3 autofills the
+        # fee fields there (an extra RPC per tx), which would shadow the
+        # shared max_fee quote build_and_sign applies below
+        tx = {
+            'to': tba_address,
+            'from': controller.address,
+            'value': 0,
+            'data': '0x' + data.hex(),
+            'gas': EXECUTOR_GAS_LIMIT,
+        }
 
+        # Pre-flight the exact call as the controller: a revert (e.g.
+        # NotOwner) surfaces here with its reason instead of costing a
+        # failed on-chain transaction
+        try:
+            await w3.eth.call({'to': tba_address, 'from': controller.address,
+                               'data': tx['data']})
+        except Exception as preflight_err:
+            print(f"{tag} Pre-flight {method} reverted: {preflight_err}")
+            print(f"{tag} Aborting before broadcasting a doomed transaction.")
+            return False
+
+        # Serialize signing/broadcast so concurrent tokens get sequential
+        # nonces; only the receipt wait runs concurrently
+        async with send_lock:
+            signed = await build_and_sign(w3, controller, tx,
+                                          nonce=next(nonce_counter),
+                                          max_fee=max_fee)
+            receipt_task = await broadcast(w3, signed)
+        receipt = await receipt_task
+
+        # Single verification read, pinned to the tx's block so the result
+        # is consistent with the state the receipt confirmed
+        try:
+            is_authorized = await call_view(
+                w3, tba_address, _SEL["isAuthorizedExecutor"],
+                ['address'], [pkp_address], 'bool',
+                block_identifier=receipt['blockNumber'],
+            )
+        except Exception as verify_err:
+            print(f"{tag} Could not verify: {verify_err}")
+            is_authorized = None
 
-def main():
+        if receipt['status'] == 1:
+            print(f"{tag} SUCCESS! PKP whitelisted as executor")
+            print(f"{tag} TX Hash: {receipt['transactionHash'].hex()}")
+            print(f"{tag} Gas Used: {receipt['gasUsed']}")
+        else:
+            print(f"{tag} ERROR: Transaction failed")
+            return False
+
+    except Exception as e:
+        print(f"\n{tag} {method} failed: {e}")
+        print(f"{tag} The TBA may require a different method for executor management.")
+        print(f"{tag} Check the Tokenbound V3 documentation for your specific implementation.")
+        return False
+
+    # Verify (the read already happened at the receipt's block — no
+    # extra sequential RPC here)
+    print(f"{tag} PKP authorized: {is_authorized}")
+    if is_authorized is None:
+        print(f"{tag} Check manually on block explorer")
+    elif not is_authorized:
+        print(f"{tag} WARNING: Verification failed - PKP may not be authorized")
+
+    return bool(is_authorized)
+
+
+async def main():
     parser = argparse.ArgumentParser(description="Whitelist PKP on TBA")
     parser.add_argument("--pkp-address", help="PKP ETH address to whitelist")
-    parser.add_argument("--token-id", type=int, default=1, help="Token ID (default: 1)")
+    parser.add_argument("--token-ids", default="1",
+                        help="Comma-separated token IDs (default: 1)")
     parser.add_argument("--dry-run", action="store_true", help="Don't send transaction")
     args = parser.parse_args()
-    
+
+    token_ids = [int(x) for x in args.token_ids.split(",")]
+
     print("=" * 60)
     print("Whitelist PKP on Tokenbound V3 TBA")
     print("=" * 60)
-    
+
     # Get PKP address
     pkp_address = args.pkp_address or get_pkp_address()
     if not pkp_address:
@@ -180,139 +379,64 @@ def main():
         print("  2. Set LIT_PKP_ETH_ADDRESS in .env")
         print("  3. Use --pkp-address argument")
         sys.exit(1)
-    
+
     print(f"\nPKP Address to whitelist: {pkp_address}")
-    print(f"Token ID: {args.token_id}")
-    
+    print(f"Token IDs: {token_ids}")
+
     # Connect to network
-    w3 = Web3(Web3.HTTPProvider(RPC_URL))
-    print(f"\nConnected to Base Sepolia, block: {w3.eth.block_number}")
-    
+    w3 = _ctx.async_w3()
+
     # Setup controller account
-    controller = Account.from_key(CONTROLLER_KEY)
+    controller = _ctx.controller()
+
+    # One block-number read for the banner, one nonce fetch shared by all
+    # tokens in the sweep
+    block_number, base_nonce = await asyncio.gather(
+        w3.eth.block_number,
+        w3.eth.get_transaction_count(controller.address),
+    )
+    print(f"\nConnected to Base Sepolia, block: {block_number}")
     print(f"Controller: {controller.address}")
-    
-    # Get contract instances
-    nft_contract = w3.eth.contract(address=CONTRACT_ADDRESS, abi=NFT_ABI)
-    
-    # Get TBA address
-    tba_address = nft_contract.functions.getAgentTBA(args.token_id).call()
-    print(f"TBA Address: {tba_address}")
-    
-    # Get current owner
-    owner = nft_contract.functions.ownerOf(args.token_id).call()
-    print(f"Current NFT Owner: {owner}")
-    
-    # Check if controller is owner (required to set executor)
-    if owner.lower() != controller.address.lower():
-        print(f"\nWARNING: Controller is not the NFT owner!")
-        print(f"  Controller: {controller.address}")
-        print(f"  Owner: {owner}")
-        print("\nThe NFT owner must call setExecutor on the TBA.")
-        print("If the NFT is already self-owning, this may need to be done via the TBA itself.")
-        
-        if not args.dry_run:
-            response = input("\nContinue anyway? (y/N): ")
-            if response.lower() != 'y':
-                sys.exit(0)
-    
-    # Get TBA contract
-    tba_contract = w3.eth.contract(address=tba_address, abi=TBA_ABI)
-    
-    # Check if PKP is already authorized
-    print("\n" + "-" * 40)
-    print("Checking current executor status...")
-    
-    try:
-        is_authorized = tba_contract.functions.isAuthorizedExecutor(pkp_address).call()
-        print(f"PKP already authorized: {is_authorized}")
-        
-        if is_authorized:
-            print("\nPKP is already whitelisted! No action needed.")
-            return
-    except Exception as e:
-        print(f"Note: Could not check executor status: {e}")
-        print("TBA may use different method names. Proceeding with setExecutor...")
-    
-    if args.dry_run:
-        print("\n[DRY RUN] Would send setExecutor transaction")
-        print(f"  TBA: {tba_address}")
-        print(f"  PKP: {pkp_address}")
-        print(f"  Authorized: True")
-        return
-    
-    # Build the transaction to whitelist PKP
-    print("\n" + "-" * 40)
-    print("Sending setExecutor transaction...")
-    
-    try:
-        # Try setExecutor(address, bool)
-        tx = tba_contract.functions.setExecutor(
-            pkp_address,
-            True
-        ).build_transaction({
-            'from': controller.address,
-        })
-        
-        receipt = send_transaction(w3, controller, tx)
-        
-        if receipt['status'] == 1:
-            print(f"\nSUCCESS! PKP whitelisted as executor")
-            print(f"TX Hash: {receipt['transactionHash'].hex()}")
-            print(f"Gas Used: {receipt['gasUsed']}")
-        else:
-            print(f"\nERROR: Transaction failed")
-            sys.exit(1)
-            
-    except Exception as e:
-        print(f"\nsetExecutor failed: {e}")
-        print("\nTrying addExecutor instead...")
-        
-        try:
-            tx = tba_contract.functions.addExecutor(
-                pkp_address
-            ).build_transaction({
-                'from': controller.address,
-            })
-            
-            receipt = send_transaction(w3, controller, tx)
-            
-            if receipt['status'] == 1:
-                print(f"\nSUCCESS! PKP added as executor")
-                print(f"TX Hash: {receipt['transactionHash'].hex()}")
-            else:
-                print(f"\nERROR: Transaction failed")
-                sys.exit(1)
-                
-        except Exception as e2:
-            print(f"\naddExecutor also failed: {e2}")
-            print("\nThe TBA may require a different method for executor management.")
-            print("Check the Tokenbound V3 documentation for your specific implementation.")
-            sys.exit(1)
-    
-    # Verify
-    print("\n" + "-" * 40)
-    print("Verifying executor status...")
-    
-    try:
-        is_authorized = tba_contract.functions.isAuthorizedExecutor(pkp_address).call()
-        print(f"PKP authorized: {is_authorized}")
-        
-        if is_authorized:
-            print("\n" + "=" * 60)
-            print("PKP WHITELISTED SUCCESSFULLY!")
-            print("=" * 60)
-            print("\nThe TBA will remain controllable after Ouroboros transfer.")
-            print("\nNEXT STEPS:")
-            print("1. Fund PKP address with Base Sepolia ETH")
-            print("2. Run test_ouroboros.py to test with Token ID 2")
-            print("3. Execute Ouroboros on Token ID 1")
-        else:
-            print("\nWARNING: Verification failed - PKP may not be authorized")
-    except Exception as e:
-        print(f"Could not verify: {e}")
-        print("Check manually on block explorer")
+
+    send_lock = asyncio.Lock()
+    nonce_counter = iter(range(base_nonce, base_nonce + len(token_ids)))
+
+    # One fee quote shared by the whole batch: every tx carries the same
+    # maxFeePerGas instead of re-querying fee history per token
+    max_fee = None
+    if not args.dry_run:
+        max_fee = (await _base_fee(w3)) * 2 + _PRIORITY_FEE
+
+    # Process all tokens concurrently; the interactive owner-mismatch
+    # prompt only makes sense for a single-token run. return_exceptions
+    # keeps one token's unexpected failure (e.g. a nonexistent token id
+    # reverting the TBA lookup) from cancelling siblings whose
+    # transactions may already be in flight
+    results = await asyncio.gather(*(
+        process_token(w3, controller, pkp_address, token_id,
+                      args.dry_run, len(token_ids) == 1,
+                      send_lock, nonce_counter, max_fee)
+        for token_id in token_ids
+    ), return_exceptions=True)
+    for token_id, result in zip(token_ids, results):
+        if isinstance(result, BaseException):
+            print(f"[token {token_id}] ERROR: {result}")
+    results = [result is True for result in results]
+
+    if all(results):
+        print("\n" + "=" * 60)
+        print("PKP WHITELISTED SUCCESSFULLY!")
+        print("=" * 60)
+        print("\nThe TBA will remain controllable after Ouroboros transfer.")
+        print("\nNEXT STEPS:")
+        print("1. Fund PKP address with Base Sepolia ETH")
+        print("2. Run test_ouroboros.py to test with Token ID 2")
+        print("3. Execute Ouroboros on Token ID 1")
+    else:
+        failed = [t for t, ok in zip(token_ids, results) if not ok]
+        print(f"\nWhitelisting incomplete for token(s): {failed}")
+        sys.exit(1)
 
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
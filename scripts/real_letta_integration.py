@@ -17,7 +17,9 @@ import os
 import sys
 import json
 import hashlib
+import asyncio
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 from dotenv import load_dotenv
@@ -27,7 +29,14 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 try:
     from web3 import Web3
+    from eth_abi import encode as abi_encode
     from eth_account import Account
+    # eth-hash's auto backend binds the fastest installed keccak C
+    # extension; calling it directly skips Web3.keccak's text/hexstr/
+    # primitive dispatch on every multi-MB hash (set ETH_HASH_BACKEND to
+    # pin a specific backend)
+    from eth_hash.auto import keccak
+    from _merkle import merkle_root
 except ImportError:
     print("Please install dependencies: pip install web3 python-dotenv requests")
     sys.exit(1)
@@ -35,6 +44,33 @@ except ImportError:
 # Load environment variables
 load_dotenv(Path(__file__).parent.parent / ".env")
 
+# orjson serializes straight to compact UTF-8 bytes and sorts keys far
+# faster than stdlib json; fall back silently when it isn't installed
+try:
+    from orjson import (
+        OPT_SORT_KEYS as _OPT_SORT_KEYS,
+        dumps as _orjson_dumps,
+        loads as _json_loads,
+    )
+
+    def _canonical_dumps(obj) -> bytes:
+        return _orjson_dumps(obj, option=_OPT_SORT_KEYS)
+except ImportError:
+    _json_loads = json.loads  # stdlib loads accepts bytes directly too
+
+    def _canonical_dumps(obj) -> bytes:
+        # ensure_ascii=False emits raw UTF-8 like orjson does; the default
+        # \uXXXX escaping would hash non-ASCII states to a different root
+        return json.dumps(obj, sort_keys=True, separators=(',', ':'),
+                          ensure_ascii=False).encode()
+
+# zstandard compresses the highly repetitive state JSON 5-10x for disk
+# persistence; fall back to writing plain JSON when it isn't installed
+try:
+    import zstandard as zstd
+except ImportError:
+    zstd = None
+
 # Letta API Configuration
 LETTA_BASE_URL = "https://cyansociety.a.pinggy.link"
 LETTA_PASSWORD = "TWIJftq/ufbbxo8w51m/BQ1wBNrZb/JTlmnopxyz"
@@ -59,6 +95,17 @@ CONTRACT_ABI = [
         "stateMutability": "nonpayable",
         "type": "function"
     },
+    {
+        "inputs": [
+            {"name": "tokenIds", "type": "uint256[]"},
+            {"name": "stateHashes", "type": "bytes32[]"},
+            {"name": "stateUris", "type": "string[]"}
+        ],
+        "name": "anchorStateBatch",
+        "outputs": [],
+        "stateMutability": "nonpayable",
+        "type": "function"
+    },
     {
         "inputs": [{"name": "tokenId", "type": "uint256"}],
         "name": "getStateAnchor",
@@ -76,21 +123,118 @@ CONTRACT_ABI = [
         "outputs": [{"name": "", "type": "address"}],
         "stateMutability": "view",
         "type": "function"
+    },
+    {
+        "anonymous": False,
+        "inputs": [
+            {"indexed": True, "name": "tokenId", "type": "uint256"},
+            {"indexed": False, "name": "stateHash", "type": "bytes32"},
+            {"indexed": False, "name": "stateUri", "type": "string"}
+        ],
+        "name": "StateAnchored",
+        "type": "event"
     }
 ]
 
+# Anchor-call selectors, hashed once at import; calldata is assembled by
+# hand below so each send skips build_transaction's ABI re-encoding
+_ANCHOR_SEL = Web3.keccak(text='anchorState(uint256,bytes32,string)')[:4]
+_ANCHOR_BATCH_SEL = Web3.keccak(text='anchorStateBatch(uint256[],bytes32[],string[])')[:4]
+
+
+_API_HEADERS = {
+    "Authorization": f"Bearer {LETTA_PASSWORD}",
+    "Content-Type": "application/json"
+}
+
+# Shared session: keeps the TLS connection to the Letta API alive across
+# calls (the handshake dominates each request otherwise) and retries
+# transient gateway errors
+_SESSION = requests.Session()
+_SESSION.headers.update(_API_HEADERS)
+_SESSION.mount("https://", requests.adapters.HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=8,
+    max_retries=requests.adapters.Retry(
+        total=3, backoff_factor=0.2, status_forcelist=[429, 502, 503, 504]
+    ),
+))
+
+# httpx with HTTP/2 multiplexes concurrent API calls as streams on one
+# TLS connection instead of HTTP/1.1's one-request-per-connection; fall
+# back to the pooled requests session when httpx (or h2) isn't installed
+try:
+    import httpx
+    _HTTPX_CLIENT = httpx.Client(http2=True, headers=_API_HEADERS, timeout=30.0)
+    # httpx errors don't subclass requests'; catch whichever transport
+    # is actually in play when wrapping API calls
+    _API_ERRORS = (requests.exceptions.RequestException, httpx.HTTPError)
+except ImportError:
+    httpx = None
+    _HTTPX_CLIENT = None
+    _API_ERRORS = (requests.exceptions.RequestException,)
+
 
 def letta_api_request(endpoint: str, method: str = "GET") -> dict:
     """Make an authenticated request to the Letta API."""
     url = f"{LETTA_BASE_URL}/v1/{endpoint}"
-    headers = {
-        "Authorization": f"Bearer {LETTA_PASSWORD}",
-        "Content-Type": "application/json"
-    }
-    
-    response = requests.request(method, url, headers=headers, timeout=30)
+    if _HTTPX_CLIENT is not None:
+        response = _HTTPX_CLIENT.request(method, url)
+    else:
+        response = _SESSION.request(method, url, timeout=30)
     response.raise_for_status()
-    return response.json()
+    # Parse the raw bytes directly (orjson when available): skips the
+    # UTF-8 decode pass response.json() makes over multi-MB payloads
+    return _json_loads(response.content)
+
+
+# Pages fetched per concurrent burst when paginating archival memory;
+# each burst costs roughly one round-trip over the multiplexed connection
+_PAGE_BURST = 8
+
+
+async def fetch_archival_pages(agent_id: str, page_size: int = 100) -> list:
+    """Fetch archival-memory pages concurrently over one HTTP/2 connection.
+
+    Pages ride as parallel streams on a single TLS connection, requested
+    in bursts of _PAGE_BURST until a short page marks the end — a burst
+    costs roughly one round-trip instead of one per page. Requires
+    httpx; export_agent_state checks for it and falls back to the
+    single-request path when it isn't installed.
+    """
+    entries = []
+    async with httpx.AsyncClient(http2=True, headers=_API_HEADERS,
+                                 timeout=30.0) as client:
+        offset_page = 0
+        while True:
+            responses = await asyncio.gather(*(
+                client.get(
+                    f"{LETTA_BASE_URL}/v1/agents/{agent_id}/archival-memory"
+                    f"?limit={page_size}&offset={(offset_page + i) * page_size}"
+                    f"&include_embeddings=false")
+                for i in range(_PAGE_BURST)
+            ))
+            for response in responses:
+                response.raise_for_status()
+                page = _json_loads(response.content)
+                entries.extend(page)
+                if len(page) < page_size:
+                    return entries
+            offset_page += _PAGE_BURST
+
+
+# Whitelist of archival-entry fields that enter the Merkle leaf
+# preimage, with the default used when the API omits a field. These
+# pairs are part of the hashed bytes: letta/anchor_state_tool.py
+# mirrors the same projection, and the two must stay in lockstep (with
+# a schema_version bump) for both paths to anchor the same root
+_KEPT_FIELDS = (
+    ('id', None),
+    ('text', ''),
+    ('tags', []),
+    ('created_at', None),
+    ('updated_at', None),
+)
 
 
 def export_agent_state(agent_id: str) -> dict:
@@ -103,12 +247,30 @@ def export_agent_state(agent_id: str) -> dict:
     - Agent metadata
     """
     print(f"Exporting state for agent: {agent_id}")
-    
-    # Get agent details (includes memory blocks)
-    agent_data = letta_api_request(f"agents/{agent_id}")
-    
-    # Get archival memory
-    archival_data = letta_api_request(f"agents/{agent_id}/archival-memory")
+
+    # The agent-details and archival-memory GETs are independent; run
+    # them in parallel over the shared pooled session so wall time is
+    # the slower call, not the sum of both
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        agent_future = executor.submit(letta_api_request, f"agents/{agent_id}")
+        # Ask the server not to serialize the embedding vectors at all:
+        # they're discarded client-side anyway, and dropping them at the
+        # source saves most of the transfer and parse cost per entry.
+        # With httpx installed the pages are fetched concurrently over
+        # one HTTP/2 connection; otherwise one request pulls everything
+        if httpx is not None:
+            archival_future = executor.submit(
+                asyncio.run, fetch_archival_pages(agent_id))
+        else:
+            archival_future = executor.submit(
+                letta_api_request,
+                f"agents/{agent_id}/archival-memory?include_embeddings=false")
+        agent_data = agent_future.result()
+        archival_data = archival_future.result()
+
+    # Deterministic entry order regardless of how the API pages results
+    archival_data = sorted(
+        archival_data, key=lambda e: (e.get('created_at') or '', e.get('id') or ''))
     
     # Extract memory blocks
     memory_blocks = {}
@@ -120,20 +282,21 @@ def export_agent_state(agent_id: str) -> dict:
             'char_count': len(block.get('value', ''))
         }
     
-    # Process archival memory (exclude embeddings for hashing - they're large and derived)
-    archival_entries = []
-    for entry in archival_data:
-        archival_entries.append({
-            'id': entry.get('id'),
-            'text': entry.get('text', ''),
-            'tags': entry.get('tags', []),
-            'created_at': entry.get('created_at'),
-            # Note: We exclude 'embedding' as it's derived data and very large
-        })
+    # Process archival memory (exclude embeddings for hashing - they're
+    # large and derived). A single comprehension over the _KEPT_FIELDS
+    # whitelist replaces the per-entry append loop; updated_at is kept
+    # so edited entries change their leaf hash (and the leaf cache key)
+    archival_entries = [
+        {field: entry.get(field, default) for field, default in _KEPT_FIELDS}
+        for entry in archival_data
+    ]
     
     # Build the state object
+    # 2.0.0: anchored hash became the composed root (per-section
+    # sub-hashes + archival Merkle root) and entries carry updated_at —
+    # roots are not comparable with 1.0.0 whole-JSON keccak anchors
     state = {
-        'schema_version': '1.0.0',
+        'schema_version': '2.0.0',
         'export_timestamp': datetime.now(timezone.utc).isoformat(),
         'agent': {
             'id': agent_data.get('id'),
@@ -150,31 +313,108 @@ def export_agent_state(agent_id: str) -> dict:
     return state
 
 
-def hash_state(state: dict) -> bytes:
+# Leaf-hash cache for archival entries, keyed by entry
+# id + created_at + updated_at so edits invalidate their leaf. Unchanged
+# entries (the vast majority between anchors) cost one dict lookup
+# instead of a serialize+keccak pass.
+LEAF_CACHE_FILE = Path(__file__).parent.parent / "exports" / "archival_leaf_cache.json"
+
+
+def _load_leaf_cache() -> dict:
+    try:
+        return json.loads(LEAF_CACHE_FILE.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_leaf_cache(cache: dict):
+    LEAF_CACHE_FILE.parent.mkdir(exist_ok=True)
+    LEAF_CACHE_FILE.write_text(json.dumps(cache))
+
+
+def archival_merkle_root(entries: list) -> bytes:
+    """Merkle root over the archival entries, with cached leaf hashes.
+
+    Each leaf is keccak of the entry's canonical JSON; leaves are looked
+    up in the on-disk cache by id+created_at+updated_at, so only new or
+    edited entries are re-serialized and re-hashed (an edit bumps
+    updated_at and misses the cache). The leaves then reduce by
+    pairwise keccak (odd node promoted) to a single root that changes
+    iff any entry changes — O(delta + log N) work per anchor instead of
+    rehashing every entry.
     """
-    Hash the state using keccak256 (Ethereum standard).
-    
-    Uses canonical JSON (sorted keys) for deterministic hashing.
+    cache = _load_leaf_cache()
+    leaves = []
+    fresh_cache = {}
+    dirty = False
+    for entry in entries:
+        key = f"{entry.get('id')}:{entry.get('created_at')}:{entry.get('updated_at')}"
+        cached = cache.get(key)
+        if cached:
+            leaf = bytes.fromhex(cached)
+        else:
+            leaf = keccak(_canonical_dumps(entry))
+            dirty = True
+        fresh_cache[key] = leaf.hex()
+        leaves.append(leaf)
+    # Rewrite only when a leaf was computed or a stale entry dropped out
+    if dirty or len(fresh_cache) != len(cache):
+        _save_leaf_cache(fresh_cache)
+
+    return merkle_root(leaves)
+
+
+def compute_state_root(state: dict, archival_root: bytes) -> bytes:
+    """Combine per-section sub-hashes into the anchored state root.
+
+    state_root = keccak(agent_hash || memory_blocks_hash ||
+    archival_merkle_root || schema_version_hash). The agent, schema and
+    memory-block sections are a handful of short strings, so their
+    keccaks are recomputed every run — hashing them costs microseconds,
+    and a mutable field like agent.name must never be served from a
+    stale cache. Only the archival side is big enough to be worth
+    delta-hashing, and it arrives pre-reduced as its Merkle root.
     """
-    state_json = json.dumps(state, sort_keys=True, separators=(',', ':'))
-    return Web3.keccak(text=state_json)
+    agent_hash = keccak(_canonical_dumps(state['agent']))
+    schema_hash = keccak(state['schema_version'].encode())
+    memory_blocks_hash = keccak(_canonical_dumps(state['memory_blocks']))
+
+    return keccak(agent_hash + memory_blocks_hash + archival_root + schema_hash)
 
 
 def send_transaction(w3: Web3, account: Account, tx: dict) -> dict:
-    """Sign and send a transaction, return receipt."""
-    tx['nonce'] = w3.eth.get_transaction_count(account.address)
+    """Sign and send a transaction, return receipt.
+
+    The nonce, gas-estimate and fee lookups are independent RPC calls
+    (~100ms each against the public endpoint), so they run in parallel
+    instead of back to back. chainId is the cached module constant — no
+    eth_chainId round-trip.
+    """
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        nonce_future = executor.submit(w3.eth.get_transaction_count, account.address)
+        gas_future = (executor.submit(w3.eth.estimate_gas, tx)
+                      if 'gas' not in tx else None)
+        # fee_history returns just the fee fields (a full latest block
+        # can be hundreds of KB) and lets us price the priority fee from
+        # recent medians instead of a flat guess
+        fees_future = (executor.submit(w3.eth.fee_history, 5, 'latest', [50])
+                       if 'maxFeePerGas' not in tx else None)
+
+        tx['nonce'] = nonce_future.result()
+        if gas_future is not None:
+            tx['gas'] = gas_future.result()
+        # Use EIP-1559 transaction format
+        if fees_future is not None:
+            history = fees_future.result()
+            base_fee = history['baseFeePerGas'][-1]
+            rewards = [r[0] for r in history.get('reward') or [] if r]
+            priority_fee = max(rewards[-1] if rewards else 0,
+                               1_000_000)  # floor: 0.001 gwei
+            tx['maxFeePerGas'] = base_fee * 2 + priority_fee
+            tx['maxPriorityFeePerGas'] = priority_fee
+
     tx['chainId'] = CHAIN_ID
-    
-    if 'gas' not in tx:
-        tx['gas'] = w3.eth.estimate_gas(tx)
-    
-    # Use EIP-1559 transaction format
-    if 'maxFeePerGas' not in tx:
-        base_fee = w3.eth.get_block('latest')['baseFeePerGas']
-        priority_fee = w3.to_wei(0.001, 'gwei')
-        tx['maxFeePerGas'] = base_fee * 2 + priority_fee
-        tx['maxPriorityFeePerGas'] = priority_fee
-    
+
     signed = account.sign_transaction(tx)
     tx_hash = w3.eth.send_raw_transaction(signed.raw_transaction)
     receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
@@ -194,7 +434,7 @@ def main():
     
     try:
         state = export_agent_state(AGENT_ID)
-    except requests.exceptions.RequestException as e:
+    except _API_ERRORS as e:
         print(f"ERROR: Failed to connect to Letta API: {e}")
         sys.exit(1)
     
@@ -205,16 +445,25 @@ def main():
     print(f"Archival memories: {state['archival_memory']['count']}")
     print(f"Export timestamp: {state['export_timestamp']}")
     
-    # Calculate state size
-    state_json = json.dumps(state, sort_keys=True, separators=(',', ':'))
-    print(f"Total state size: {len(state_json):,} bytes")
-    
+    # Serialize once: the same canonical bytes feed the size report and
+    # the hash below (the old code ran the multi-MB dumps twice)
+    state_bytes = _canonical_dumps(state)
+    print(f"Total state size: {len(state_bytes):,} bytes")
+
     # ========== STEP 2: Hash the State ==========
     print("\n" + "-" * 40)
     print("STEP 2: Hashing State (keccak256)")
     print("-" * 40)
-    
-    state_hash = hash_state(state)
+
+    # Archival entries enter the hash through their Merkle root, so
+    # re-anchoring after a handful of new memories only hashes the new
+    # leaves (cached by id+created_at+updated_at) rather than every entry
+    archival_root = archival_merkle_root(state['archival_memory']['entries'])
+    # The anchored root is composed from per-section sub-hashes (agent,
+    # memory blocks, archival Merkle root, schema version) so identical
+    # states yield identical roots regardless of export time
+    state_hash = compute_state_root(state, archival_root)
+    print(f"Archival Merkle root: 0x{archival_root.hex()}")
     print(f"State hash: 0x{state_hash.hex()}")
     
     # For now, use a placeholder URI (in production, upload to IPFS)
@@ -251,24 +500,52 @@ def main():
     
     # Get contract instance
     contract = w3.eth.contract(address=CONTRACT_ADDRESS, abi=CONTRACT_ABI)
-    
+
+    # Resolve ABI entries once up front: every .functions.X access
+    # rebuilds a ContractFunction from the ABI, which adds up if this
+    # flow ever loops over multiple tokens
+    get_agent_tba = contract.get_function_by_name('getAgentTBA')
+
     # Use token ID 1 (Kieran's token)
     token_id = 1
-    
+
     # Get TBA address
-    tba_address = contract.functions.getAgentTBA(token_id).call()
+    tba_address = get_agent_tba(token_id).call()
     print(f"Token ID: {token_id}")
     print(f"TBA Address: {tba_address}")
     
-    # Build and send anchor transaction
+    # Build and send anchor transaction. With one agent this is a plain
+    # anchorState; a multi-agent run goes through anchorStateBatch so N
+    # anchors share a single signature, nonce and confirmation wait
+    anchors = [(token_id, state_hash, state_uri)]
+
+    # anchorState's gas envelope is bounded by the URI length (storage
+    # writes plus nonzero calldata bytes); a static cap per anchor skips
+    # the estimate_gas simulation round-trip entirely. The cap is loose
+    # on purpose: a token's first anchor pays cold zero->nonzero SSTOREs
+    # (~165k total with the 21k intrinsic), and unused gas under the cap
+    # is never charged, while an out-of-gas revert burns the whole fee
+    anchor_gas = sum(250_000 + 16 * len(uri.encode()) for _, _, uri in anchors)
+
     print("\nSending anchor transaction...")
-    anchor_tx = contract.functions.anchorState(
-        token_id,
-        state_hash,
-        state_uri
-    ).build_transaction({
+    # Hand-assembled calldata (selector + eth_abi.encode) skips
+    # build_transaction's per-send ABI dispatch and re-encoding
+    if len(anchors) == 1:
+        data = _ANCHOR_SEL + abi_encode(
+            ['uint256', 'bytes32', 'string'], list(anchors[0]))
+    else:
+        token_ids, state_hashes, state_uris = map(list, zip(*anchors))
+        data = _ANCHOR_BATCH_SEL + abi_encode(
+            ['uint256[]', 'bytes32[]', 'string[]'],
+            [token_ids, state_hashes, state_uris])
+
+    anchor_tx = {
+        'to': CONTRACT_ADDRESS,
         'from': executor.address,
-    })
+        'value': 0,
+        'data': data,
+        'gas': anchor_gas,
+    }
     
     receipt = send_transaction(w3, executor, anchor_tx)
     
@@ -289,18 +566,23 @@ def main():
     print("\n" + "-" * 40)
     print("STEP 4: Verifying Anchored State")
     print("-" * 40)
-    
-    # Wait for a new block to ensure state is updated
-    import time
-    print("Waiting for block confirmation...")
-    time.sleep(3)
-    
-    anchor = contract.functions.getStateAnchor(token_id).call()
-    stored_hash, stored_uri, timestamp = anchor
-    
+
+    # The receipt already carries the StateAnchored log the contract
+    # emitted, so decode that instead of sleeping for a block and
+    # re-reading the anchor over RPC
+    anchored_events = contract.events.StateAnchored().process_receipt(receipt)
+    if not anchored_events:
+        print("\n[FAILURE] No StateAnchored event in receipt!")
+        sys.exit(1)
+
+    event_args = anchored_events[0]['args']
+    stored_hash = event_args['stateHash']
+    stored_uri = event_args['stateUri']
+    block_number = receipt['blockNumber']
+
     print(f"Stored hash: 0x{stored_hash.hex()}")
     print(f"Stored URI: {stored_uri}")
-    print(f"Timestamp: {timestamp}")
+    print(f"Anchored in block: {block_number}")
     
     if stored_hash == state_hash:
         print("\n[SUCCESS] State hash verified on-chain!")
@@ -321,7 +603,7 @@ Results:
 State Anchored:
   Hash: 0x{state_hash.hex()[:32]}...
   URI: {state_uri}
-  Timestamp: {timestamp}
+  Block: {block_number}
   
 Memory Blocks Included:
 {chr(10).join(f"  - {k}: {v['char_count']} chars" for k, v in state['memory_blocks'].items())}
@@ -340,11 +622,19 @@ This proves:
   4. No Letta codebase modification needed!
 """)
     
-    # Save state to file for reference
-    output_file = Path(__file__).parent.parent / "exports" / f"state_{timestamp}.json"
-    output_file.parent.mkdir(exist_ok=True)
-    with open(output_file, 'w') as f:
-        json.dump(state, f, indent=2)
+    # Save state to file for reference. The canonical bytes from the
+    # sizing step are valid JSON, so write them verbatim (zstd-compressed
+    # when available) rather than re-serializing. Naming by state-hash
+    # prefix means identical states dedupe naturally on disk
+    exports_dir = Path(__file__).parent.parent / "exports"
+    exports_dir.mkdir(exist_ok=True)
+    stem = f"state_{state_hash.hex()[:16]}"
+    if zstd is not None:
+        output_file = exports_dir / f"{stem}.json.zst"
+        output_file.write_bytes(zstd.ZstdCompressor(level=3).compress(state_bytes))
+    else:
+        output_file = exports_dir / f"{stem}.json"
+        output_file.write_bytes(state_bytes)
     print(f"State saved to: {output_file}")
 
 
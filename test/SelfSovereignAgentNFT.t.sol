@@ -232,11 +232,83 @@ contract SelfSovereignAgentNFTTest is Test {
     function test_AnchorState_RevertUnauthorized() public {
         vm.prank(alice);
         uint256 tokenId = agentNFT.mintAgent(alice, "ipfs://1", address(0), 0);
-        
+
         vm.prank(bob);
         vm.expectRevert(SelfSovereignAgentNFT.Unauthorized.selector);
         agentNFT.anchorState(tokenId, bytes32(0), "ipfs://state/1");
     }
+
+    function test_AnchorStateBatch_ByOwner() public {
+        vm.startPrank(alice);
+        uint256 tokenA = agentNFT.mintAgent(alice, "ipfs://1", address(0), 0);
+        uint256 tokenB = agentNFT.mintAgent(alice, "ipfs://2", address(0), 0);
+        vm.stopPrank();
+
+        uint256[] memory tokenIds = new uint256[](2);
+        tokenIds[0] = tokenA;
+        tokenIds[1] = tokenB;
+        bytes32[] memory stateHashes = new bytes32[](2);
+        stateHashes[0] = keccak256("state A");
+        stateHashes[1] = keccak256("state B");
+        string[] memory stateUris = new string[](2);
+        stateUris[0] = "ipfs://state/a";
+        stateUris[1] = "ipfs://state/b";
+
+        vm.expectEmit(true, false, false, true);
+        emit StateAnchored(tokenA, stateHashes[0], stateUris[0]);
+        vm.expectEmit(true, false, false, true);
+        emit StateAnchored(tokenB, stateHashes[1], stateUris[1]);
+
+        vm.prank(alice);
+        agentNFT.anchorStateBatch(tokenIds, stateHashes, stateUris);
+
+        (bytes32 hashA, string memory uriA,) = agentNFT.getStateAnchor(tokenA);
+        (bytes32 hashB, string memory uriB,) = agentNFT.getStateAnchor(tokenB);
+
+        assertEq(hashA, stateHashes[0]);
+        assertEq(uriA, stateUris[0]);
+        assertEq(hashB, stateHashes[1]);
+        assertEq(uriB, stateUris[1]);
+    }
+
+    function test_AnchorStateBatch_RevertUnauthorizedForAnyToken() public {
+        uint256 anchorPermission = agentNFT.PERMISSION_ANCHOR_STATE();
+
+        vm.prank(alice);
+        uint256 tokenA = agentNFT.mintAgent(alice, "ipfs://1", executor, anchorPermission);
+        // Executor has no permission on bob's token
+        vm.prank(bob);
+        uint256 tokenB = agentNFT.mintAgent(bob, "ipfs://2", address(0), 0);
+
+        uint256[] memory tokenIds = new uint256[](2);
+        tokenIds[0] = tokenA;
+        tokenIds[1] = tokenB;
+        bytes32[] memory stateHashes = new bytes32[](2);
+        stateHashes[0] = keccak256("state A");
+        stateHashes[1] = keccak256("state B");
+        string[] memory stateUris = new string[](2);
+        stateUris[0] = "ipfs://state/a";
+        stateUris[1] = "ipfs://state/b";
+
+        vm.prank(executor);
+        vm.expectRevert(SelfSovereignAgentNFT.Unauthorized.selector);
+        agentNFT.anchorStateBatch(tokenIds, stateHashes, stateUris);
+    }
+
+    function test_AnchorStateBatch_RevertArrayLengthMismatch() public {
+        vm.prank(alice);
+        uint256 tokenId = agentNFT.mintAgent(alice, "ipfs://1", address(0), 0);
+
+        uint256[] memory tokenIds = new uint256[](1);
+        tokenIds[0] = tokenId;
+        bytes32[] memory stateHashes = new bytes32[](2);
+        string[] memory stateUris = new string[](1);
+        stateUris[0] = "ipfs://state/a";
+
+        vm.prank(alice);
+        vm.expectRevert(SelfSovereignAgentNFT.ArrayLengthMismatch.selector);
+        agentNFT.anchorStateBatch(tokenIds, stateHashes, stateUris);
+    }
     
     // ============ Liveness Tests ============
     